@@ -9,6 +9,7 @@ Authentication: GitHub OAuth with username allowlist
 """
 
 import os
+import time
 import logging
 import httpx
 from functools import wraps
@@ -22,15 +23,23 @@ logger = logging.getLogger(__name__)
 FLASK_URL = os.environ.get('FLASK_URL', 'http://localhost:8443')
 GITHUB_CLIENT_ID = os.environ.get('GITHUB_CLIENT_ID')
 GITHUB_CLIENT_SECRET = os.environ.get('GITHUB_CLIENT_SECRET')
-GITHUB_ALLOWED_USERS = set(os.environ.get('GITHUB_ALLOWED_USERS', '').split(','))
+GITHUB_ALLOWED_USERS = frozenset(
+    user.strip()
+    for user in os.environ.get('GITHUB_ALLOWED_USERS', '').split(',')
+    if user.strip()
+)
 BASE_URL = os.environ.get('BASE_URL', 'https://ganymede.tail0410a7.ts.net:10000')
 
+# The service catalog only changes when the Flask server reloads its
+# credentials, so successful /services responses are reused briefly.
+SERVICES_CACHE_TTL = 60  # seconds
+
 # Validate GitHub OAuth configuration
 if not GITHUB_CLIENT_ID or not GITHUB_CLIENT_SECRET:
     logger.error("GITHUB_CLIENT_ID and GITHUB_CLIENT_SECRET must be set!")
     raise ValueError("Missing GitHub OAuth configuration")
 
-if not GITHUB_ALLOWED_USERS or GITHUB_ALLOWED_USERS == {''}:
+if not GITHUB_ALLOWED_USERS:
     logger.warning("No GitHub users in allowlist! Set GITHUB_ALLOWED_USERS")
 
 # Create GitHub auth provider
@@ -48,6 +57,34 @@ mcp = FastMCP(
     auth=auth  # GitHub OAuth authentication
 )
 
+# Shared HTTP client for talking to the Flask backend. Created lazily inside
+# the server's event loop and reused across tool calls so connections to
+# FLASK_URL stay alive between invocations.
+_http: httpx.AsyncClient | None = None
+
+
+def get_http() -> httpx.AsyncClient:
+    """Get or create the shared HTTP client for the Flask backend."""
+    global _http
+    if _http is None or _http.is_closed:
+        _http = httpx.AsyncClient(
+            base_url=FLASK_URL,
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+    return _http
+
+
+# (fetched_at monotonic timestamp, services list) from the last good /services call
+_services_cache: tuple[float, list[str]] | None = None
+
+
+def cached_services() -> list[str] | None:
+    """Return the service catalog if it was fetched recently, else None."""
+    if _services_cache and time.monotonic() - _services_cache[0] < SERVICES_CACHE_TTL:
+        return _services_cache[1]
+    return None
+
 
 def require_allowlist(func: Callable) -> Callable:
     """Decorator to check if authenticated user is in the allowlist."""
@@ -104,20 +141,30 @@ async def create_session(context: Context, services: list[str], ttl_minutes: int
     if ttl_minutes > 480:  # 8 hours max
         return {"error": "ttl_minutes cannot exceed 480 (8 hours)"}
 
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{FLASK_URL}/sessions",
-                json={"services": services, "ttl_minutes": ttl_minutes},
-                timeout=10
-            )
+    # Reject obviously bad service lists locally when the catalog is cached
+    if not services:
+        return {"error": "services list is required"}
+    known = cached_services()
+    if known is not None:
+        unknown = set(services) - set(known)
+        if unknown:
+            return {
+                "error": f"unknown services: {sorted(unknown)}",
+                "available": sorted(known)
+            }
 
-            if response.status_code == 400:
-                return response.json()
+    try:
+        response = await get_http().post(
+            "/sessions",
+            json={"services": services, "ttl_minutes": ttl_minutes}
+        )
 
-            response.raise_for_status()
+        if response.status_code == 400:
             return response.json()
 
+        response.raise_for_status()
+        return response.json()
+
     except httpx.TimeoutException:
         return {"error": "timeout connecting to proxy server"}
     except httpx.ConnectError:
@@ -142,17 +189,13 @@ async def revoke_session(context: Context, session_id: str) -> dict:
         Dictionary with status ("revoked") or error message
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                f"{FLASK_URL}/sessions/{session_id}",
-                timeout=10
-            )
+        response = await get_http().delete(f"/sessions/{session_id}")
 
-            if response.status_code == 404:
-                return {"status": "not_found", "message": "Session not found or already expired"}
+        if response.status_code == 404:
+            return {"status": "not_found", "message": "Session not found or already expired"}
 
-            response.raise_for_status()
-            return response.json()
+        response.raise_for_status()
+        return response.json()
 
     except httpx.TimeoutException:
         return {"error": "timeout connecting to proxy server"}
@@ -180,14 +223,17 @@ async def list_services(context: Context) -> dict:
         - "bsky": Bluesky/ATProtocol API
         - "github_api": GitHub REST API
     """
+    global _services_cache
+    known = cached_services()
+    if known is not None:
+        return {"services": list(known)}
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{FLASK_URL}/services",
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await get_http().get("/services")
+        response.raise_for_status()
+        data = response.json()
+        _services_cache = (time.monotonic(), list(data.get("services", [])))
+        return data
 
     except httpx.TimeoutException:
         return {"error": "timeout connecting to proxy server"}
@@ -7,19 +7,36 @@ Service-aware credential handling with built-in support for:
 - Git: Pseudo-service using local git/gh CLI (no credentials needed)
 """
 
+import hashlib
 import json
 import os
 import logging
 import threading
 import time
 from dataclasses import dataclass, field
-from typing import Optional
-from datetime import datetime, timedelta
+from typing import Callable, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# Shared session for credential exchanges (e.g. ATProto createSession/refreshSession)
+# so repeated token fetches reuse the TLS connection to the auth server.
+_auth_http = requests.Session()
+_auth_http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+
+# ATProto access tokens typically expire in 2 hours; refresh 5 minutes early
+ATPROTO_TOKEN_LIFETIME = 2 * 60 * 60  # seconds
+ATPROTO_REFRESH_MARGIN = 5 * 60  # seconds
+
+# ATProto sessions are persisted here so a restart can reuse (or refresh)
+# them instead of calling createSession again for every service
+ATPROTO_SESSION_CACHE_DIR = os.environ.get(
+    "ATPROTO_SESSION_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "credential-proxy")
+)
 
 # Known service configurations (base URLs, auth flows)
 KNOWN_SERVICES = {
@@ -34,6 +51,29 @@ KNOWN_SERVICES = {
 }
 
 
+def _header_injector(name: str, value: str) -> Callable[[dict, str], tuple[dict, str]]:
+    """Build an injector that sets a fixed header value."""
+    def inject(headers: dict, url: str) -> tuple[dict, str]:
+        headers[name] = value
+        return headers, url
+    return inject
+
+
+def _query_injector(param: str, value: str) -> Callable[[dict, str], tuple[dict, str]]:
+    """Build an injector that appends a fixed query parameter."""
+    pair = f"{param}={value}"
+
+    def inject(headers: dict, url: str) -> tuple[dict, str]:
+        separator = "&" if "?" in url else "?"
+        return headers, f"{url}{separator}{pair}"
+    return inject
+
+
+def _no_auth(headers: dict, url: str) -> tuple[dict, str]:
+    """Injector for services without a configured credential."""
+    return headers, url
+
+
 @dataclass
 class ATProtoSession:
     """Cached ATProto session with access and refresh tokens."""
@@ -41,7 +81,28 @@ class ATProtoSession:
     refresh_jwt: str
     did: str
     handle: str
-    expires_at: datetime
+    expires_at: float  # time.monotonic() deadline
+
+    def to_dict(self) -> dict:
+        """Serialize for persistence, converting the deadline to wall-clock time."""
+        return {
+            "access_jwt": self.access_jwt,
+            "refresh_jwt": self.refresh_jwt,
+            "did": self.did,
+            "handle": self.handle,
+            "expires_at_epoch": time.time() + (self.expires_at - time.monotonic())
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ATProtoSession":
+        """Restore a persisted session, converting the deadline back to monotonic time."""
+        return cls(
+            access_jwt=data["access_jwt"],
+            refresh_jwt=data["refresh_jwt"],
+            did=data["did"],
+            handle=data["handle"],
+            expires_at=time.monotonic() + (data["expires_at_epoch"] - time.time())
+        )
 
 
 @dataclass
@@ -61,10 +122,30 @@ class ServiceCredential:
     _atproto_session: Optional[ATProtoSession] = field(default=None, repr=False)
     _session_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
 
+    # Auth injection strategy, resolved once from service_type in __post_init__
+    _injector: Callable[[dict, str], tuple[dict, str]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.service_type == "atproto":
+            self._injector = self._inject_atproto
+            self._atproto_session = self._load_persisted_session()
+        elif self.service_type == "bearer" and self.credential:
+            self._injector = _header_injector("Authorization", f"Bearer {self.credential}")
+        elif self.service_type == "header" and self.credential:
+            self._injector = _header_injector(self.auth_header or "X-API-Key", self.credential)
+        elif self.service_type == "query" and self.credential:
+            self._injector = _query_injector(self.query_param or "api_key", self.credential)
+        else:
+            self._injector = _no_auth
+
     def inject_auth(self, headers: dict, url: str) -> tuple[dict, str]:
         """
         Inject authentication into request headers and/or URL.
 
+        The headers dict is modified in place, so callers must pass a dict
+        they own (forward_request passes the fresh dict built by
+        filter_request_headers).
+
         Args:
             headers: Request headers dict (will be modified)
             url: Request URL
@@ -72,42 +153,34 @@ class ServiceCredential:
         Returns:
             Tuple of (modified headers, modified URL)
         """
-        headers = dict(headers)  # Copy to avoid modifying original
-
-        if self.service_type == "atproto":
-            # Get or refresh ATProto session token
-            token = self._get_atproto_token()
-            if token:
-                headers["Authorization"] = f"Bearer {token}"
-            else:
-                logger.error("Failed to get ATProto session token")
-
-        elif self.service_type == "bearer":
-            if self.credential:
-                headers["Authorization"] = f"Bearer {self.credential}"
-
-        elif self.service_type == "header":
-            header_name = self.auth_header or "X-API-Key"
-            if self.credential:
-                headers[header_name] = self.credential
-
-        elif self.service_type == "query":
-            param_name = self.query_param or "api_key"
-            if self.credential:
-                separator = "&" if "?" in url else "?"
-                url = f"{url}{separator}{param_name}={self.credential}"
+        return self._injector(headers, url)
 
+    def _inject_atproto(self, headers: dict, url: str) -> tuple[dict, str]:
+        """Inject the current ATProto access token, refreshing it if needed."""
+        token = self._get_atproto_token()
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        else:
+            logger.error("Failed to get ATProto session token")
         return headers, url
 
     def _get_atproto_token(self) -> Optional[str]:
         """Get a valid ATProto access token, creating/refreshing session as needed."""
+        # Fast path without the lock: sessions are replaced, never mutated,
+        # so a single attribute read gives a consistent snapshot.
+        session = self._atproto_session
+        if session and session.expires_at - time.monotonic() > ATPROTO_REFRESH_MARGIN:
+            return session.access_jwt
+
+        # Slow path: one thread refreshes while the others wait on the lock,
+        # then find the new session in the re-check below.
         with self._session_lock:
-            now = datetime.utcnow()
+            now = time.monotonic()
 
             # Check if we have a valid cached session
             if self._atproto_session:
                 # Refresh if token expires in less than 5 minutes
-                if self._atproto_session.expires_at > now + timedelta(minutes=5):
+                if self._atproto_session.expires_at - now > ATPROTO_REFRESH_MARGIN:
                     return self._atproto_session.access_jwt
 
                 # Try to refresh
@@ -127,7 +200,7 @@ class ServiceCredential:
             return False
 
         try:
-            response = requests.post(
+            response = _auth_http.post(
                 f"{self.base_url}/com.atproto.server.createSession",
                 json={
                     "identifier": self.identifier,
@@ -138,15 +211,15 @@ class ServiceCredential:
             response.raise_for_status()
             data = response.json()
 
-            # ATProto access tokens typically expire in 2 hours
             self._atproto_session = ATProtoSession(
                 access_jwt=data["accessJwt"],
                 refresh_jwt=data["refreshJwt"],
                 did=data["did"],
                 handle=data["handle"],
-                expires_at=datetime.utcnow() + timedelta(hours=2)
+                expires_at=time.monotonic() + ATPROTO_TOKEN_LIFETIME
             )
 
+            self._persist_session()
             logger.info(f"Created ATProto session for {data['handle']}")
             return True
 
@@ -160,7 +233,7 @@ class ServiceCredential:
             return False
 
         try:
-            response = requests.post(
+            response = _auth_http.post(
                 f"{self.base_url}/com.atproto.server.refreshSession",
                 headers={"Authorization": f"Bearer {self._atproto_session.refresh_jwt}"},
                 timeout=10
@@ -173,9 +246,10 @@ class ServiceCredential:
                 refresh_jwt=data["refreshJwt"],
                 did=data["did"],
                 handle=data["handle"],
-                expires_at=datetime.utcnow() + timedelta(hours=2)
+                expires_at=time.monotonic() + ATPROTO_TOKEN_LIFETIME
             )
 
+            self._persist_session()
             logger.info(f"Refreshed ATProto session for {data['handle']}")
             return True
 
@@ -184,6 +258,44 @@ class ServiceCredential:
             self._atproto_session = None
             return False
 
+    def _session_cache_path(self) -> str:
+        """Path of the persisted session file for this account."""
+        key = hashlib.sha256(f"{self.base_url}|{self.identifier}".encode()).hexdigest()[:16]
+        return os.path.join(ATPROTO_SESSION_CACHE_DIR, f"atproto-{key}.json")
+
+    def _load_persisted_session(self) -> Optional[ATProtoSession]:
+        """Load a previously persisted ATProto session, if any."""
+        if not self.identifier:
+            return None
+
+        path = self._session_cache_path()
+        try:
+            with open(path, 'r') as f:
+                session = ATProtoSession.from_dict(json.load(f))
+            logger.info(f"Loaded persisted ATProto session for {session.handle}")
+            return session
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable ATProto session cache {path}: {e}")
+            return None
+
+    def _persist_session(self) -> None:
+        """Write the current ATProto session to disk (owner-only, atomic replace)."""
+        if not self._atproto_session:
+            return
+
+        path = self._session_cache_path()
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._atproto_session.to_dict(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist ATProto session to {path}: {e}")
+
 
 class CredentialStore:
     """
@@ -212,6 +324,9 @@ class CredentialStore:
             config_path: Path to credentials.json. Defaults to same directory as this file.
         """
         self._credentials: dict[str, ServiceCredential] = {}
+        self._fingerprint: Optional[tuple[int, int]] = None
+        # Bumped whenever the service map is replaced, so callers can cache derived data
+        self.version = 0
 
         if config_path is None:
             config_path = os.path.join(os.path.dirname(__file__), "credentials.json")
@@ -219,27 +334,50 @@ class CredentialStore:
         self._config_path = config_path
         self._load()
 
+    def _stat_fingerprint(self) -> Optional[tuple[int, int]]:
+        """Return (mtime_ns, size) of the config file, or None if it is missing."""
+        try:
+            st = os.stat(self._config_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
     def _load(self) -> None:
-        """Load credentials from JSON file."""
-        if not os.path.exists(self._config_path):
+        """
+        Load credentials from JSON file.
+
+        The new service map is built separately and swapped in with a single
+        assignment, so concurrent get() calls never observe a partial load.
+        If the file cannot be parsed, the previously loaded credentials stay
+        in place.
+        """
+        fingerprint = self._stat_fingerprint()
+        if fingerprint is None:
             logger.warning(f"Credentials file not found: {self._config_path}")
             logger.info("Create credentials.json from credentials.example.json")
+            self._credentials = {}
+            self._fingerprint = None
+            self.version += 1
             return
 
         try:
             with open(self._config_path, 'r') as f:
                 config = json.load(f)
 
+            credentials: dict[str, ServiceCredential] = {}
             for service_name, service_config in config.items():
                 try:
                     cred = self._parse_service_config(service_name, service_config)
                     if cred:
-                        self._credentials[service_name] = cred
+                        credentials[service_name] = cred
                         logger.info(f"Loaded credentials for service: {service_name} (type: {cred.service_type})")
                 except Exception as e:
                     logger.error(f"Error loading service {service_name}: {e}")
 
-            logger.info(f"Loaded {len(self._credentials)} service(s) from {self._config_path}")
+            self._credentials = credentials
+            self._fingerprint = fingerprint
+            self.version += 1
+            logger.info(f"Loaded {len(credentials)} service(s) from {self._config_path}")
 
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in {self._config_path}: {e}")
@@ -338,6 +476,12 @@ class CredentialStore:
         return service in self._credentials
 
     def reload(self) -> None:
-        """Reload credentials from config file."""
-        self._credentials.clear()
+        """
+        Reload credentials from config file if it has changed.
+
+        Unchanged files (same mtime and size) are skipped, which also keeps
+        cached ATProto sessions alive.
+        """
+        if self._stat_fingerprint() == self._fingerprint:
+            return
         self._load()
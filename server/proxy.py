@@ -5,17 +5,38 @@ Forwards requests to upstream services with credential injection.
 Streams responses back to avoid buffering large payloads.
 """
 
+import json
 import logging
 import requests
+from http.cookiejar import DefaultCookiePolicy
 from flask import Response, stream_with_context
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from typing import Mapping, Optional
 
-from credentials import CredentialStore
+from credentials import ServiceCredential
 
 logger = logging.getLogger(__name__)
 
-# Headers that should not be forwarded (hop-by-hop headers)
-HOP_BY_HOP_HEADERS = {
+# Bytes per chunk when streaming upstream responses back to the client
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Prebuilt bodies for the fixed upstream error responses
+UPSTREAM_TIMEOUT_BODY = b'{"error": "upstream timeout"}'
+UPSTREAM_CONNECTION_FAILED_BODY = b'{"error": "upstream connection failed"}'
+
+# Pooled upstream session: keeps connections to bsky.social, api.github.com,
+# etc. alive across proxied requests. Cookies are never stored, since the
+# session is shared by every caller of the proxy. No automatic retries -
+# the client decides whether a failed request is safe to repeat.
+_upstream = requests.Session()
+_upstream.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+_upstream_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=64, max_retries=0)
+_upstream.mount("https://", _upstream_adapter)
+_upstream.mount("http://", _upstream_adapter)
+
+# Headers that should not be forwarded (hop-by-hop headers), lowercase
+HOP_BY_HOP_HEADERS = frozenset({
     'connection',
     'keep-alive',
     'proxy-authenticate',
@@ -28,24 +49,25 @@ HOP_BY_HOP_HEADERS = {
     # Also exclude our custom auth headers
     'x-session-id',
     'x-auth-key',
-}
+})
 
-# Response headers that should not be forwarded back
-EXCLUDED_RESPONSE_HEADERS = {
+# Response headers that should not be forwarded back, lowercase
+EXCLUDED_RESPONSE_HEADERS = frozenset({
     'connection',
     'keep-alive',
     'transfer-encoding',
-    'content-encoding',  # Let Flask handle encoding
+    'content-encoding',  # Re-added by forward_request when relaying compressed bodies
     'content-length',    # Will be recalculated
-}
+})
 
 
-def filter_request_headers(headers: dict) -> dict:
+def filter_request_headers(headers: Mapping[str, str]) -> dict:
     """
     Filter out hop-by-hop and internal headers from request.
 
     Args:
-        headers: Original request headers
+        headers: Original request headers (any mapping, e.g. request.headers
+            itself; it is only iterated once)
 
     Returns:
         Filtered headers dict
@@ -56,16 +78,22 @@ def filter_request_headers(headers: dict) -> dict:
     }
 
 
-def filter_response_headers(headers: dict) -> dict:
+def filter_response_headers(headers: Mapping[str, str]) -> dict:
     """
     Filter response headers for forwarding back to client.
 
     Args:
-        headers: Upstream response headers
+        headers: Upstream response headers. A requests CaseInsensitiveDict
+                 is used as-is via its pre-lowercased keys.
 
     Returns:
         Filtered headers dict
     """
+    if isinstance(headers, CaseInsensitiveDict):
+        return {
+            k: v for k, v in headers.lower_items()
+            if k not in EXCLUDED_RESPONSE_HEADERS
+        }
     return {
         k: v for k, v in headers.items()
         if k.lower() not in EXCLUDED_RESPONSE_HEADERS
@@ -74,45 +102,35 @@ def filter_response_headers(headers: dict) -> dict:
 
 def forward_request(
     service: str,
+    cred: ServiceCredential,
     path: str,
     method: str,
-    headers: dict,
+    headers: Mapping[str, str],
     body: Optional[bytes],
-    query_string: str,
-    credential_store: CredentialStore
+    query_string: str
 ) -> Response:
     """
     Forward a request to an upstream service with credential injection.
 
     Args:
-        service: Service name to forward to
+        service: Service name to forward to (for logging)
+        cred: Resolved credential configuration for the service
         path: URL path after the service base URL
         method: HTTP method (GET, POST, etc.)
         headers: Request headers
         body: Request body (if any)
         query_string: Query string from original request
-        credential_store: CredentialStore instance for credential lookup
 
     Returns:
         Flask Response object with streamed upstream response
     """
-    # Get service credentials
-    cred = credential_store.get(service)
-    if cred is None:
-        logger.warning(f"Unknown service requested: {service}")
-        return Response(
-            f'{{"error": "unknown service: {service}"}}',
-            status=404,
-            mimetype='application/json'
-        )
-
     # Build target URL
     base_url = cred.base_url.rstrip('/')
     target_url = f"{base_url}/{path}"
     if query_string:
         target_url = f"{target_url}?{query_string}"
 
-    # Filter and prepare headers
+    # Filter and prepare headers (fresh dict, safe for inject_auth to modify)
     forward_headers = filter_request_headers(headers)
 
     # Inject authentication
@@ -122,7 +140,7 @@ def forward_request(
 
     try:
         # Make upstream request with streaming
-        upstream_resp = requests.request(
+        upstream_resp = _upstream.request(
             method=method,
             url=target_url,
             headers=forward_headers,
@@ -132,10 +150,20 @@ def forward_request(
         )
 
         # Stream response back
-        response_headers = filter_response_headers(dict(upstream_resp.headers))
+        response_headers = filter_response_headers(upstream_resp.headers)
+
+        content_encoding = upstream_resp.headers.get('Content-Encoding')
+        if content_encoding and headers.get('Accept-Encoding'):
+            # The caller's own Accept-Encoding was forwarded, so the upstream
+            # encoding is one it accepts: relay the compressed bytes as-is
+            # instead of decoding them here.
+            response_headers['Content-Encoding'] = content_encoding
+            body_stream = upstream_resp.raw.stream(STREAM_CHUNK_SIZE, decode_content=False)
+        else:
+            body_stream = upstream_resp.iter_content(chunk_size=STREAM_CHUNK_SIZE)
 
         return Response(
-            stream_with_context(upstream_resp.iter_content(chunk_size=8192)),
+            stream_with_context(body_stream),
             status=upstream_resp.status_code,
             headers=response_headers,
             content_type=upstream_resp.headers.get('Content-Type', 'application/octet-stream')
@@ -144,7 +172,7 @@ def forward_request(
     except requests.exceptions.Timeout:
         logger.error(f"Timeout proxying to {service}/{path}")
         return Response(
-            '{"error": "upstream timeout"}',
+            UPSTREAM_TIMEOUT_BODY,
             status=504,
             mimetype='application/json'
         )
@@ -152,7 +180,7 @@ def forward_request(
     except requests.exceptions.ConnectionError as e:
         logger.error(f"Connection error proxying to {service}/{path}: {e}")
         return Response(
-            '{"error": "upstream connection failed"}',
+            UPSTREAM_CONNECTION_FAILED_BODY,
             status=502,
             mimetype='application/json'
         )
@@ -160,7 +188,7 @@ def forward_request(
     except Exception as e:
         logger.error(f"Error proxying to {service}/{path}: {e}")
         return Response(
-            f'{{"error": "proxy error: {str(e)}"}}',
+            json.dumps({"error": f"proxy error: {e}"}),
             status=500,
             mimetype='application/json'
         )
@@ -10,18 +10,28 @@ Provides:
 All file operations use temporary directories with automatic cleanup.
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from urllib.parse import urlparse
+from werkzeug.exceptions import RequestEntityTooLarge
 import subprocess
 import os
+import re
+import fcntl
+import hashlib
+import hmac
 import logging
 from datetime import datetime
 import tempfile
 import shutil
+import requests
+from requests.adapters import HTTPAdapter
 
 # Local modules
-from sessions import SessionStore
-from credentials import CredentialStore
-from proxy import forward_request
+from sessions import SessionStore, SessionStoreFull
+from credentials import CredentialStore, ServiceCredential
+from proxy import STREAM_CHUNK_SIZE, forward_request
 
 # Load .env file if it exists
 try:
@@ -45,6 +55,35 @@ if not SECRET_KEY:
     logger.warning("PROXY_SECRET_KEY not set! Using insecure default.")
     SECRET_KEY = 'CHANGE-ME-INSECURE'
 
+# Optional persistent cache of bare repository mirrors. When set, fetch-bundle
+# updates a cached mirror instead of cloning from scratch on every request.
+BUNDLE_CACHE_DIR = os.environ.get('BUNDLE_CACHE_DIR')
+
+# Size cap for BUNDLE_CACHE_DIR; least recently used mirrors are removed
+# once it is exceeded.
+BUNDLE_CACHE_MAX_BYTES = int(os.environ.get('BUNDLE_CACHE_MAX_MB', '2048')) * 1024 * 1024
+
+# Optional cap on request bodies (mainly pushed bundles). Oversized uploads
+# are rejected with 413 before Werkzeug reads them.
+if os.environ.get('MAX_CONTENT_LENGTH_MB'):
+    app.config['MAX_CONTENT_LENGTH'] = int(os.environ['MAX_CONTENT_LENGTH_MB']) * 1024 * 1024
+
+# Hosts that fetch-bundle/push-bundle may clone from (comma-separated)
+ALLOWED_GIT_HOSTS = frozenset(
+    host.strip().lower()
+    for host in os.environ.get('ALLOWED_GIT_HOSTS', 'github.com').split(',')
+    if host.strip()
+)
+
+# Buffer size for copying uploaded bundles to disk
+BUNDLE_COPY_BUFFER_SIZE = 1024 * 1024
+
+# Last path segment of a repo URL, minus any .git suffix or trailing slash
+REPO_NAME_PATTERN = re.compile(r'([^/]+?)(?:\.git)?/?$')
+
+# Last two path segments of a repo URL (owner/repo)
+REPO_SLUG_PATTERN = re.compile(r'([^/:]+)/([^/]+?)(?:\.git)?/?$')
+
 # Detect gh CLI at startup
 GH_PATH = shutil.which('gh')
 if not GH_PATH:
@@ -59,16 +98,81 @@ if GH_PATH:
 else:
     logger.warning("GitHub CLI (gh) not found - PR creation will fail")
 
+# Pooled client for GitHub REST calls (PR creation)
+github_http = requests.Session()
+github_http.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 # Initialize session and credential stores
 session_store = SessionStore()
 credential_store = CredentialStore()
 
+# (credential store version, available services), see get_available_services()
+_services_cache: tuple[int, frozenset[str]] | None = None
+
 logger.info(f"Loaded {len(credential_store.list_services())} service(s) from credential store")
 
 
+@lru_cache(maxsize=1024)
+def repo_name_from_url(repo_url: str) -> str:
+    """Derive a directory/bundle name from a repository URL."""
+    match = REPO_NAME_PATTERN.search(repo_url)
+    name = match.group(1) if match else ''
+    return name if name not in ('', '.', '..') else 'repo'
+
+
+@lru_cache(maxsize=1024)
+def parse_repo_url(repo_url: str) -> tuple[str, str] | None:
+    """Extract (owner, repo) from a repository URL, or None if it has no owner segment."""
+    match = REPO_SLUG_PATTERN.search(repo_url)
+    return (match.group(1), match.group(2)) if match else None
+
+
+def validate_repo_url(repo_url: str) -> str | None:
+    """
+    Check that a repository URL is safe to hand to git.
+
+    Only https URLs on ALLOWED_GIT_HOSTS are accepted. This also keeps
+    ssh/file/ext transports and option-like arguments away from git.
+
+    Returns:
+        Error message if the URL is rejected, None if it is acceptable
+    """
+    if repo_url.startswith('-'):
+        return 'invalid repo_url'
+    try:
+        parsed = urlparse(repo_url)
+        hostname = parsed.hostname
+    except ValueError:
+        return 'invalid repo_url'
+    if parsed.scheme != 'https':
+        return 'repo_url must be an https URL'
+    if hostname not in ALLOWED_GIT_HOSTS:
+        return f'repo_url host not allowed: {hostname}'
+    return None
+
+
+def manual_pr_url(slug: tuple[str, str], branch: str) -> str:
+    """GitHub 'open a pull request' page for a branch."""
+    owner, repo = slug
+    return f"https://github.com/{owner}/{repo}/pull/new/{branch}"
+
+
 def verify_auth(auth_header):
     """Verify legacy authentication token (X-Auth-Key)"""
-    return auth_header == SECRET_KEY
+    return hmac.compare_digest((auth_header or '').encode(), SECRET_KEY.encode())
+
+
+def get_available_services() -> frozenset[str]:
+    """
+    Services that can be granted to a session, including the 'git' pseudo-service.
+
+    Cached until the credential store reloads a changed config.
+    """
+    global _services_cache
+    version = credential_store.version
+    if _services_cache is None or _services_cache[0] != version:
+        _services_cache = (version, frozenset(credential_store.list_services()) | {'git'})
+    return _services_cache[1]
 
 
 def verify_session_or_key(service: str = 'git') -> bool:
@@ -115,7 +219,7 @@ def create_session():
     Input: {"services": ["bsky", "github", "git"], "ttl_minutes": 30}
     Output: {"session_id": "...", "proxy_url": "...", "expires_in_minutes": 30, "services": [...]}
     """
-    data = request.json or {}
+    data = request.get_json(silent=True) or {}
     services = data.get('services', [])
     ttl_minutes = data.get('ttl_minutes', 30)
 
@@ -125,16 +229,26 @@ def create_session():
     if not isinstance(services, list):
         return jsonify({'error': 'services must be a list'}), 400
 
+    if not all(isinstance(s, str) for s in services):
+        return jsonify({'error': 'services must be a list of strings'}), 400
+
     # Validate services exist (git is always valid as pseudo-service)
-    available = set(credential_store.list_services()) | {'git'}
-    invalid = set(services) - available
+    requested = frozenset(services)
+    available = get_available_services()
+    invalid = requested - available
     if invalid:
         return jsonify({
-            'error': f'unknown services: {list(invalid)}',
+            'error': f'unknown services: {sorted(invalid)}',
             'available': sorted(available)
         }), 400
 
-    session = session_store.create(services, ttl_minutes)
+    # Duplicates are dropped; keep the caller's order otherwise
+    services = list(dict.fromkeys(services))
+    try:
+        session = session_store.create(services, ttl_minutes)
+    except SessionStoreFull as e:
+        logger.warning(f"Refusing session: {e}")
+        return jsonify({'error': 'too many active sessions, try again later'}), 503
 
     # Build proxy URL from request host
     scheme = 'https' if request.is_secure else 'http'
@@ -162,11 +276,8 @@ def revoke_session(session_id: str):
 @app.route('/services', methods=['GET'])
 def list_services():
     """List available services that can be included in sessions."""
-    services = credential_store.list_services()
-    # Always include 'git' as a pseudo-service
-    if 'git' not in services:
-        services = services + ['git']
-    return jsonify({'services': sorted(services)})
+    # Always includes 'git' as a pseudo-service
+    return jsonify({'services': sorted(get_available_services())})
 
 
 # =============================================================================
@@ -199,17 +310,23 @@ def proxy_request(service: str, rest: str):
     if not session.has_service(service):
         return jsonify({
             'error': f'session does not have access to {service}',
-            'session_services': session.services
+            'session_services': sorted(session.services)
         }), 403
 
+    # Resolve credentials once for this request
+    cred = credential_store.get(service)
+    if cred is None:
+        logger.warning(f"Unknown service requested: {service}")
+        return jsonify({'error': f'unknown service: {service}'}), 404
+
     return forward_request(
         service=service,
+        cred=cred,
         path=rest,
         method=request.method,
-        headers=dict(request.headers),
+        headers=request.headers,
         body=request.get_data() if request.method in ['POST', 'PUT', 'PATCH'] else None,
-        query_string=request.query_string.decode(),
-        credential_store=credential_store
+        query_string=request.query_string.decode()
     )
 
 
@@ -217,6 +334,281 @@ def proxy_request(service: str, rest: str):
 # Git Bundle Endpoints
 # =============================================================================
 
+def mirror_path_for(repo_url: str) -> str:
+    """Path of the cached bare mirror for a repository URL."""
+    digest = hashlib.sha1(repo_url.encode()).hexdigest()
+    return os.path.join(BUNDLE_CACHE_DIR, f'{digest}.git')
+
+
+@contextmanager
+def mirror_lock(repo_url: str):
+    """
+    Hold an exclusive lock on a repository's cached mirror.
+
+    Requests for the same repository serialize; different repositories
+    proceed in parallel.
+
+    Yields:
+        Path of the (possibly not yet created) bare mirror
+    """
+    mirror_path = mirror_path_for(repo_url)
+    os.makedirs(BUNDLE_CACHE_DIR, exist_ok=True)
+    with open(f'{mirror_path}.lock', 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield mirror_path
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def update_mirror(repo_url: str, mirror_path: str) -> subprocess.CompletedProcess:
+    """
+    Create the bare mirror, or fetch new branches and tags into it.
+
+    Caller holds mirror_lock. A new mirror is cloned next to its final path
+    and only moved into place once the clone succeeds, so a failed or timed
+    out clone never leaves a partial directory that looks like a mirror.
+    On success the mirror is marked as used and the cache is trimmed.
+    """
+    if os.path.isdir(mirror_path):
+        result = subprocess.run(
+            ['git', '-C', mirror_path, 'fetch', '--prune', '--tags',
+             'origin', '+refs/heads/*:refs/heads/*'],
+            capture_output=True,
+            timeout=300,
+            text=True
+        )
+    else:
+        partial_path = f'{mirror_path}.partial'
+        shutil.rmtree(partial_path, ignore_errors=True)
+        try:
+            result = subprocess.run(
+                ['git', 'clone', '--bare', repo_url, partial_path],
+                capture_output=True,
+                timeout=300,
+                text=True
+            )
+            if result.returncode == 0:
+                os.replace(partial_path, mirror_path)
+        finally:
+            shutil.rmtree(partial_path, ignore_errors=True)
+
+    if result.returncode == 0:
+        # Set explicitly: noatime/relatime mounts don't keep st_atime current
+        os.utime(mirror_path)
+        evict_mirrors(keep=mirror_path)
+    return result
+
+
+def dir_size(path: str) -> int:
+    """Total size in bytes of the files under path."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def evict_mirrors(keep: str) -> None:
+    """
+    Remove least recently used mirrors while the cache exceeds BUNDLE_CACHE_MAX_MB.
+
+    Mirrors are ordered by st_atime, which update_mirror sets on every use.
+    keep (the caller's locked mirror) and mirrors locked by other requests
+    are skipped; their small lock files are left in place.
+    """
+    mirrors = []
+    with os.scandir(BUNDLE_CACHE_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith('.git') and entry.is_dir(follow_symlinks=False):
+                mirrors.append((entry.stat().st_atime, entry.path, dir_size(entry.path)))
+
+    total = sum(size for _, _, size in mirrors)
+    for _, path, size in sorted(mirrors):
+        if total <= BUNDLE_CACHE_MAX_BYTES:
+            break
+        if path == keep:
+            continue
+        with open(f'{path}.lock', 'w') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue  # In use by another request
+            logger.info(f"Evicting cached mirror {os.path.basename(path)}")
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+
+def temp_clone(repo_url: str, repo_name: str, cleanup: ExitStack) -> tuple[str, subprocess.CompletedProcess]:
+    """Clone into a temporary directory that lives as long as cleanup."""
+    temp_dir = cleanup.enter_context(tempfile.TemporaryDirectory())
+    repo_path = os.path.join(temp_dir, repo_name)
+    logger.info(f"Cloning {repo_url} to temporary directory")
+    result = subprocess.run(
+        ['git', 'clone', repo_url, repo_path],
+        capture_output=True,
+        timeout=300,
+        text=True
+    )
+    return repo_path, result
+
+
+def stream_bundle(repo_path: str, repo_name: str, cleanup: ExitStack):
+    """
+    Stream a bundle of all refs in repo_path as git produces it.
+
+    If git fails mid-stream the response is aborted rather than ended
+    cleanly, so the client sees a broken transfer instead of a short bundle.
+
+    Args:
+        repo_path: Repository to bundle
+        repo_name: Used for the download filename
+        cleanup: Resources (temp clone) to release once the bundle has been
+            fully sent or the client disconnects
+
+    Returns:
+        Streaming response, or a JSON error if git fails before writing output
+    """
+    try:
+        logger.info(f"Creating bundle")
+        proc = subprocess.Popen(
+            ['git', 'bundle', 'create', '-', '--all'],
+            cwd=repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+
+        # Read ahead one chunk so failures still get a JSON error. A short read
+        # means git already exited (it may have written the header first).
+        first_chunk = proc.stdout.read(STREAM_CHUNK_SIZE)
+        if len(first_chunk) < STREAM_CHUNK_SIZE and proc.wait() != 0:
+            stderr = proc.stderr.read().decode(errors='replace')
+            proc.stdout.close()
+            proc.stderr.close()
+            logger.error(f"Bundle creation failed: {stderr}")
+            cleanup.close()
+            return jsonify({'error': f'bundle creation failed: {stderr}'}), 500
+    except BaseException:
+        cleanup.close()
+        raise
+
+    def generate():
+        stderr = ''
+        try:
+            yield first_chunk
+            yield from iter(lambda: proc.stdout.read(STREAM_CHUNK_SIZE), b'')
+        finally:
+            killed = proc.poll() is None
+            if killed:
+                # Client went away mid-stream
+                proc.kill()
+            # Closing stdout first lets a still-running git pack-objects child
+            # die of SIGPIPE instead of keeping the stderr pipe open
+            proc.stdout.close()
+            if proc.wait() != 0 and not killed:
+                stderr = proc.stderr.read().decode(errors='replace')
+            proc.stderr.close()
+            cleanup.close()
+
+        # Only reached when the stream ran to EOF (not on client disconnect)
+        if proc.returncode != 0:
+            logger.error(f"Bundle stream ended with exit code {proc.returncode}: {stderr}")
+            raise RuntimeError(f'git bundle exited with code {proc.returncode}')
+        logger.info(f"Bundle sent successfully")
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/octet-stream',
+        headers={'Content-Disposition': f'attachment; filename={repo_name}.bundle'}
+    )
+
+
+def send_bundle_file(repo_path: str, repo_name: str):
+    """
+    Write a bundle of all refs in repo_path to a temporary file and send it.
+
+    Used for the cached mirror: the bundle is complete by the time the caller
+    releases the mirror lock, so the download itself never holds the lock.
+
+    Returns:
+        File response, or a JSON error if git fails
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bundle_path = os.path.join(temp_dir, f'{repo_name}.bundle')
+
+        logger.info(f"Creating bundle")
+        result = subprocess.run(
+            ['git', 'bundle', 'create', bundle_path, '--all'],
+            cwd=repo_path,
+            capture_output=True,
+            timeout=300,
+            text=True
+        )
+        if result.returncode != 0:
+            logger.error(f"Bundle creation failed: {result.stderr}")
+            return jsonify({'error': f'bundle creation failed: {result.stderr}'}), 500
+
+        # The open handle keeps the data readable after the directory is removed
+        bundle = open(bundle_path, 'rb')
+
+    response = send_file(
+        bundle,
+        mimetype='application/octet-stream',
+        as_attachment=True,
+        download_name=f'{repo_name}.bundle'
+    )
+    response.content_length = os.fstat(bundle.fileno()).st_size
+    return response
+
+
+def create_pull_request(cred: ServiceCredential, owner: str, repo: str, branch: str,
+                        title: str, body: str) -> tuple[str | None, str | None]:
+    """
+    Open a pull request against the repository's default branch via the GitHub REST API.
+
+    Args:
+        cred: The github_api credential
+        owner: Repository owner
+        repo: Repository name
+        branch: Head branch (already pushed)
+        title: PR title
+        body: PR body
+
+    Returns:
+        (pr_url, None) on success, (None, error message) on failure
+    """
+    repo_api = f"{cred.base_url.rstrip('/')}/repos/{owner}/{repo}"
+    headers, repo_api = cred.inject_auth({'Accept': 'application/vnd.github+json'}, repo_api)
+    # Query-param credentials come back in the URL; keep them after the path
+    path, sep, query = repo_api.partition('?')
+    pulls_api = f'{path}/pulls{sep}{query}'
+
+    try:
+        resp = github_http.get(repo_api, headers=headers, timeout=30)
+        if not resp.ok:
+            return None, f"repo lookup failed ({resp.status_code}): {resp.text}"
+        base = resp.json()['default_branch']
+
+        resp = github_http.post(
+            pulls_api,
+            json={'title': title, 'body': body, 'head': branch, 'base': base},
+            headers=headers,
+            timeout=30
+        )
+        if resp.status_code != 201:
+            return None, f"PR creation failed ({resp.status_code}): {resp.text}"
+        return resp.json()['html_url'], None
+
+    except requests.RequestException as e:
+        return None, str(e)
+    except (KeyError, ValueError) as e:
+        # Malformed or unexpected JSON from the API
+        return None, f"unexpected GitHub response: {e!r}"
+
+
 @app.route('/git/fetch-bundle', methods=['POST'])
 def fetch_bundle():
     """
@@ -225,7 +617,7 @@ def fetch_bundle():
     Input: {"repo_url": "https://github.com/user/repo.git", "branch": "main"}
     Output: Binary bundle file
 
-    Files are cloned to temporary directory and cleaned up immediately after bundling.
+    Files are cloned to temporary directory and cleaned up once the bundle has been streamed.
 
     Authentication: X-Session-Id (with 'git' service) OR X-Auth-Key
     """
@@ -236,60 +628,39 @@ def fetch_bundle():
 
     repo_url = None
     try:
-        data = request.json
+        data = request.get_json(silent=True) or {}
         repo_url = data.get('repo_url')
         branch = data.get('branch', 'main')
 
         if not repo_url:
             return jsonify({'error': 'missing repo_url'}), 400
 
-        repo_name = repo_url.rstrip('/').split('/')[-1].replace('.git', '')
-        logger.info(f"Fetching bundle for {repo_url}")
+        url_error = validate_repo_url(repo_url)
+        if url_error:
+            return jsonify({'error': url_error}), 400
 
-        # Use temporary directory for clone (auto-cleanup)
-        with tempfile.TemporaryDirectory() as temp_dir:
-            repo_path = os.path.join(temp_dir, repo_name)
+        repo_name = repo_name_from_url(repo_url)
+        logger.info(f"Fetching bundle for {repo_url}")
 
-            # Clone repository
-            logger.info(f"Cloning {repo_url} to temporary directory")
-            result = subprocess.run(
-                ['git', 'clone', repo_url, repo_path],
-                capture_output=True,
-                timeout=300,
-                text=True
-            )
+        if BUNDLE_CACHE_DIR:
+            # Bring the cached mirror up to date (only new objects transfer) and
+            # bundle it; the lock is released before the download starts
+            with mirror_lock(repo_url) as repo_path:
+                logger.info(f"Updating cached mirror for {repo_url}")
+                result = update_mirror(repo_url, repo_path)
+                if result.returncode != 0:
+                    logger.error(f"Mirror update failed: {result.stderr}")
+                    return jsonify({'error': f'clone failed: {result.stderr}'}), 500
+                return send_bundle_file(repo_path, repo_name)
+
+        # Everything entered on the stack stays alive until the stream finishes
+        with ExitStack() as cleanup:
+            repo_path, result = temp_clone(repo_url, repo_name, cleanup)
             if result.returncode != 0:
                 logger.error(f"Clone failed: {result.stderr}")
                 return jsonify({'error': f'clone failed: {result.stderr}'}), 500
 
-            # Create bundle file
-            bundle_file = tempfile.NamedTemporaryFile(delete=False, suffix='.bundle')
-            bundle_path = bundle_file.name
-            bundle_file.close()
-
-            logger.info(f"Creating bundle")
-            result = subprocess.run(
-                ['git', 'bundle', 'create', bundle_path, '--all'],
-                cwd=repo_path,
-                capture_output=True,
-                timeout=60,
-                text=True
-            )
-
-            if result.returncode != 0:
-                logger.error(f"Bundle creation failed: {result.stderr}")
-                os.unlink(bundle_path)
-                return jsonify({'error': f'bundle creation failed: {result.stderr}'}), 500
-
-            logger.info(f"Bundle created successfully, temp repo cleaned up")
-
-            # Return bundle file (temp bundle file will be cleaned up by Flask after sending)
-            return send_file(
-                bundle_path,
-                mimetype='application/octet-stream',
-                as_attachment=True,
-                download_name=f'{repo_name}.bundle'
-            )
+            return stream_bundle(repo_path, repo_name, cleanup.pop_all())
 
     except subprocess.TimeoutExpired:
         logger.error(f"Timeout while fetching bundle for {repo_url}")
@@ -315,6 +686,7 @@ def push_bundle():
     Output: {"status": "success", "branch": "...", "pr_url": "..." (if created)}
 
     Files are cloned to temporary directory and cleaned up immediately after pushing.
+    With BUNDLE_CACHE_DIR set, the bundle is applied in the cached mirror instead.
 
     Authentication: X-Session-Id (with 'git' service) OR X-Auth-Key
     """
@@ -338,42 +710,67 @@ def push_bundle():
         if not repo_url or not branch:
             return jsonify({'error': 'missing repo_url or branch'}), 400
 
+        url_error = validate_repo_url(repo_url)
+        if url_error:
+            return jsonify({'error': url_error}), 400
+
         # Get bundle file
         if 'bundle' not in request.files:
             return jsonify({'error': 'missing bundle file'}), 400
 
         bundle_file = request.files['bundle']
 
-        # Save bundle to temp file
-        temp_bundle = tempfile.NamedTemporaryFile(delete=False, suffix='.bundle')
-        temp_bundle_path = temp_bundle.name
-        bundle_file.save(temp_bundle_path)
-        temp_bundle.close()
-
         logger.info(f"Pushing bundle for {repo_url}, branch {branch}")
 
-        repo_name = repo_url.rstrip('/').split('/')[-1].replace('.git', '')
+        repo_name = repo_name_from_url(repo_url)
+
+        # Everything entered on the stack is released once the push (and PR) is done
+        with ExitStack() as cleanup:
+            repo_path = None
+
+            # Copy bundle to temp file in large blocks. Werkzeug has already
+            # received the whole upload (spooling big ones to disk) while
+            # parsing the form above, so this is a local copy.
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.bundle') as temp_bundle:
+                temp_bundle_path = temp_bundle.name
+                shutil.copyfileobj(bundle_file.stream, temp_bundle, BUNDLE_COPY_BUFFER_SIZE)
+
+            if BUNDLE_CACHE_DIR:
+                # Apply the bundle in the cached mirror instead of cloning. The
+                # mirror is updated first so the bundle's prerequisites are present.
+                mirror_path = cleanup.enter_context(mirror_lock(repo_url))
+                logger.info(f"Updating cached mirror for {repo_url}")
+                result = update_mirror(repo_url, mirror_path)
+                if result.returncode == 0:
+                    repo_path = mirror_path
+                    # Stage under a scratch ref so the mirror's own branches stay
+                    # in sync with origin; removed afterwards so fetch-bundle never
+                    # hands it out.
+                    push_ref = f'refs/push/{branch}'
+                    fetch_refspec = f'+{branch}:{push_ref}'
+                    cleanup.callback(
+                        subprocess.run,
+                        ['git', 'update-ref', '-d', push_ref],
+                        cwd=mirror_path,
+                        capture_output=True,
+                        timeout=60
+                    )
+                else:
+                    logger.warning(f"Mirror update failed, falling back to a fresh clone: {result.stderr}")
 
-        # Use temporary directory for all operations
-        with tempfile.TemporaryDirectory() as temp_dir:
-            repo_path = os.path.join(temp_dir, repo_name)
+            if repo_path is None:
+                repo_path, result = temp_clone(repo_url, repo_name, cleanup)
+                if result.returncode != 0:
+                    logger.error(f"Clone failed: {result.stderr}")
+                    return jsonify({'error': f'clone failed: {result.stderr}'}), 500
 
-            # Clone repository
-            logger.info(f"Cloning {repo_url} to temporary directory")
-            result = subprocess.run(
-                ['git', 'clone', repo_url, repo_path],
-                capture_output=True,
-                timeout=300,
-                text=True
-            )
-            if result.returncode != 0:
-                logger.error(f"Clone failed: {result.stderr}")
-                return jsonify({'error': f'clone failed: {result.stderr}'}), 500
+                push_ref = branch
+                fetch_refspec = f'{branch}:{branch}'
 
             # Fetch bundle into repository
-            logger.info(f"Fetching bundle into {branch}")
+            logger.info(f"Fetching bundle into {push_ref}")
             result = subprocess.run(
-                ['git', 'fetch', temp_bundle_path, f'{branch}:{branch}'],
+                ['git', 'fetch', temp_bundle_path, fetch_refspec],
                 cwd=repo_path,
                 capture_output=True,
                 timeout=60,
@@ -387,7 +784,7 @@ def push_bundle():
             # Push branch to remote
             logger.info(f"Pushing {branch} to origin")
             result = subprocess.run(
-                ['git', 'push', 'origin', branch],
+                ['git', 'push', 'origin', f'{push_ref}:refs/heads/{branch}'],
                 cwd=repo_path,
                 capture_output=True,
                 timeout=60,
@@ -406,26 +803,46 @@ def push_bundle():
 
             # Create PR if requested
             if create_pr:
-                if not GH_PATH:
+                if not pr_title:
+                    pr_title = f"Changes from {branch}"
+                pr_body = pr_body or 'Automated PR from Claude'
+
+                github_cred = credential_store.get('github_api')
+                slug = parse_repo_url(repo_url)
+
+                if github_cred and slug:
+                    # Prefer the REST API over forking gh when a token is configured
+                    logger.info(f"Creating PR for {branch} via GitHub API")
+                    pr_url, pr_error = create_pull_request(github_cred, *slug, branch, pr_title, pr_body)
+                    if pr_url:
+                        response['pr_created'] = True
+                        response['pr_url'] = pr_url
+                        logger.info(f"PR created: {pr_url}")
+                    else:
+                        logger.warning(f"PR creation failed: {pr_error}")
+                        response['pr_created'] = False
+                        response['pr_error'] = pr_error
+                        manual_url = manual_pr_url(slug, branch)
+                        response['manual_pr_url'] = manual_url
+                        response['pr_message'] = f"PR creation failed. Create manually at: {manual_url}"
+                elif not GH_PATH:
                     # gh CLI not available - provide manual URL
                     logger.warning("PR creation requested but gh CLI not available")
                     response['pr_created'] = False
-                    try:
-                        repo_parts = repo_url.rstrip('/').replace('.git', '').split('/')
-                        owner = repo_parts[-2]
-                        repo = repo_parts[-1]
-                        manual_url = f"https://github.com/{owner}/{repo}/pull/new/{branch}"
+                    if slug:
+                        manual_url = manual_pr_url(slug, branch)
                         response['manual_pr_url'] = manual_url
                         response['pr_message'] = f"GitHub CLI not available on server. Create PR manually at: {manual_url}"
-                    except:
+                    else:
                         response['pr_message'] = "GitHub CLI not available. Create PR manually on GitHub."
                 else:
                     logger.info(f"Creating PR for {branch} using {GH_PATH}")
 
-                    if not pr_title:
-                        pr_title = f"Changes from {branch}"
+                    gh_cmd = [GH_PATH, 'pr', 'create', '--title', pr_title, '--body', pr_body, '--head', branch]
 
-                    gh_cmd = [GH_PATH, 'pr', 'create', '--title', pr_title, '--body', pr_body or 'Automated PR from Claude', '--head', branch]
+                    # Name the repo explicitly; a bare mirror has no work tree for gh to inspect
+                    if slug:
+                        gh_cmd += ['--repo', '/'.join(slug)]
 
                     result = subprocess.run(
                         gh_cmd,
@@ -446,23 +863,22 @@ def push_bundle():
                         response['pr_error'] = result.stderr
 
                         # Provide manual PR URL as fallback
-                        try:
-                            repo_parts = repo_url.rstrip('/').replace('.git', '').split('/')
-                            owner = repo_parts[-2]
-                            repo = repo_parts[-1]
-                            manual_url = f"https://github.com/{owner}/{repo}/pull/new/{branch}"
+                        if slug:
+                            manual_url = manual_pr_url(slug, branch)
                             response['manual_pr_url'] = manual_url
                             response['pr_message'] = f"PR creation failed. Create manually at: {manual_url}"
-                        except:
-                            pass
 
-            logger.info(f"Push complete, temp repo cleaned up")
+            logger.info(f"Push complete")
             return jsonify(response)
 
     except subprocess.TimeoutExpired:
         logger.error(f"Timeout while pushing bundle for {repo_url} {branch}")
         return jsonify({'error': 'operation timeout'}), 408
 
+    except RequestEntityTooLarge:
+        logger.warning(f"Rejected oversized push-bundle upload")
+        return jsonify({'error': 'bundle too large'}), 413
+
     except Exception as e:
         logger.error(f"Error pushing bundle: {e}")
         return jsonify({'error': str(e)}), 500
@@ -5,77 +5,166 @@ Provides in-memory session storage with automatic expiry.
 Sessions grant time-limited access to specified services.
 """
 
-import uuid
+import heapq
+import secrets
+import time
 import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterable, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     """Represents an authenticated session with access to specific services."""
     session_id: str
-    services: list[str]
+    services: frozenset[str]
     created_at: datetime
-    expires_at: datetime
+    expires_at: datetime  # wall clock, for display
+    expires_monotonic: float  # time.monotonic() deadline, used for expiry checks
+    # ISO strings for admin output, formatted once since the datetimes never change
+    created_at_iso: str = field(init=False, repr=False)
+    expires_at_iso: str = field(init=False, repr=False)
 
-    def is_expired(self) -> bool:
-        """Check if session has expired."""
-        return datetime.now() > self.expires_at
+    def __post_init__(self):
+        self.created_at_iso = self.created_at.isoformat()
+        self.expires_at_iso = self.expires_at.isoformat()
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """
+        Check if session has expired.
+
+        Args:
+            now: time.monotonic() snapshot to compare against, so loops can
+                 take a single reading (default: current time)
+        """
+        if now is None:
+            now = time.monotonic()
+        return now > self.expires_monotonic
 
     def has_service(self, service: str) -> bool:
         """Check if session grants access to a service."""
         return service in self.services
 
-    def time_remaining(self) -> timedelta:
+    def time_remaining(self, now: Optional[float] = None) -> timedelta:
         """Get time remaining until expiry."""
-        remaining = self.expires_at - datetime.now()
-        return remaining if remaining.total_seconds() > 0 else timedelta(0)
+        if now is None:
+            now = time.monotonic()
+        return timedelta(seconds=max(0.0, self.expires_monotonic - now))
+
+
+class SessionStoreFull(Exception):
+    """Raised when a session cannot be created because the store is full."""
 
 
 class SessionStore:
     """
     Thread-safe in-memory session store with automatic expiry.
 
-    Sessions are checked for expiry lazily on access.
-    Use cleanup_expired() for periodic cleanup if needed.
+    Sessions are checked for expiry on access; expired sessions are removed
+    by a background sweeper thread (every sweep_interval seconds) rather than
+    on the request path. Call close() to stop the sweeper.
+
+    The store holds at most max_sessions sessions. When full, expired
+    sessions are purged first; if every remaining session is still live,
+    create() raises SessionStoreFull rather than revoking one before its TTL.
     """
 
-    def __init__(self):
+    def __init__(self, max_sessions: int = 1000, sweep_interval: Optional[float] = 30.0):
         self._sessions: dict[str, Session] = {}
         self._lock = threading.Lock()
+        self._max_sessions = max_sessions
+        # (expires_monotonic, session_id) min-heap. Entries for sessions that
+        # were revoked or removed on access are skipped when popped.
+        self._expiry_heap: list[tuple[float, str]] = []
+
+        self._closed = threading.Event()
+        if sweep_interval is not None:
+            sweeper = threading.Thread(
+                target=self._sweep,
+                args=(sweep_interval,),
+                name='session-sweeper',
+                daemon=True
+            )
+            sweeper.start()
 
-    def create(self, services: list[str], ttl_minutes: int = 30) -> Session:
+    def _sweep(self, interval: float) -> None:
+        """Background loop removing expired sessions until close() is called."""
+        while not self._closed.wait(interval):
+            self.cleanup_expired()
+
+    def close(self) -> None:
+        """Stop the background sweeper."""
+        self._closed.set()
+
+    def create(self, services: Iterable[str], ttl_minutes: int = 30) -> Session:
         """
         Create a new session granting access to specified services.
 
         Args:
-            services: List of service names this session can access
+            services: Service names this session can access
             ttl_minutes: Session lifetime in minutes (default 30)
 
         Returns:
             The created Session object
+
+        Raises:
+            SessionStoreFull: If max_sessions live sessions already exist
         """
-        session_id = str(uuid.uuid4())
+        session_id = secrets.token_urlsafe(16)  # 128 bits, URL-safe
         now = datetime.now()
+        ttl = timedelta(minutes=ttl_minutes)
         session = Session(
             session_id=session_id,
-            services=list(services),  # Copy to prevent external modification
+            services=frozenset(services),
             created_at=now,
-            expires_at=now + timedelta(minutes=ttl_minutes)
+            expires_at=now + ttl,
+            expires_monotonic=time.monotonic() + ttl.total_seconds()
         )
 
         with self._lock:
+            if len(self._sessions) >= self._max_sessions:
+                self._purge_expired_locked(time.monotonic())
+                if len(self._sessions) >= self._max_sessions:
+                    raise SessionStoreFull(
+                        f'session limit reached ({self._max_sessions} active sessions)'
+                    )
             self._sessions[session_id] = session
 
+            if len(self._expiry_heap) > 2 * len(self._sessions) + 16:
+                # Mostly stale entries; rebuild from live sessions
+                self._expiry_heap = [(s.expires_monotonic, sid) for sid, s in self._sessions.items()]
+                heapq.heapify(self._expiry_heap)
+            heapq.heappush(self._expiry_heap, (session.expires_monotonic, session_id))
+
         return session
 
+    def _purge_expired_locked(self, now: float) -> int:
+        """
+        Remove expired sessions, touching only heap entries that are due.
+
+        Caller must hold the lock.
+
+        Returns:
+            Number of sessions removed
+        """
+        heap = self._expiry_heap
+        removed = 0
+        while heap and heap[0][0] < now:
+            _, sid = heapq.heappop(heap)
+            session = self._sessions.get(sid)
+            if session is not None and session.is_expired(now):
+                del self._sessions[sid]
+                removed += 1
+        return removed
+
     def get(self, session_id: str) -> Optional[Session]:
         """
         Get a session by ID if it exists and hasn't expired.
 
-        Expired sessions are lazily removed on access.
+        Takes no lock: a single dict.get is atomic under the GIL and Session
+        objects are not mutated after creation. Expired sessions are left for
+        the sweeper to remove. (A free-threaded build would need a read lock here.)
 
         Args:
             session_id: The session ID to look up
@@ -83,17 +172,10 @@ class SessionStore:
         Returns:
             Session if found and valid, None otherwise
         """
-        with self._lock:
-            session = self._sessions.get(session_id)
-            if session is None:
-                return None
-
-            if session.is_expired():
-                # Lazy cleanup of expired session
-                del self._sessions[session_id]
-                return None
-
-            return session
+        session = self._sessions.get(session_id)
+        if session is None or session.is_expired():
+            return None
+        return session
 
     def revoke(self, session_id: str) -> bool:
         """
@@ -131,33 +213,21 @@ class SessionStore:
         """
         Remove all expired sessions.
 
-        This is optional - sessions are also cleaned up lazily on access.
-        Useful for periodic cleanup to free memory.
+        Called periodically by the sweeper thread; can also be called directly.
 
         Returns:
             Number of expired sessions removed
         """
-        now = datetime.now()
-        removed = 0
-
         with self._lock:
-            expired_ids = [
-                sid for sid, session in self._sessions.items()
-                if session.is_expired()
-            ]
-            for sid in expired_ids:
-                del self._sessions[sid]
-                removed += 1
-
-        return removed
+            return self._purge_expired_locked(time.monotonic())
 
     def count(self) -> int:
         """Get the number of active (non-expired) sessions."""
         with self._lock:
-            now = datetime.now()
+            now = time.monotonic()
             return sum(
                 1 for session in self._sessions.values()
-                if not session.is_expired()
+                if not session.is_expired(now)
             )
 
     def list_sessions(self) -> list[dict]:
@@ -168,14 +238,15 @@ class SessionStore:
             List of session info dicts (without exposing full session objects)
         """
         with self._lock:
+            now = time.monotonic()
             return [
                 {
                     'session_id': session.session_id,
-                    'services': session.services,
-                    'created_at': session.created_at.isoformat(),
-                    'expires_at': session.expires_at.isoformat(),
-                    'minutes_remaining': int(session.time_remaining().total_seconds() / 60)
+                    'services': sorted(session.services),
+                    'created_at': session.created_at_iso,
+                    'expires_at': session.expires_at_iso,
+                    'minutes_remaining': int(max(0.0, session.expires_monotonic - now) / 60)
                 }
                 for session in self._sessions.values()
-                if not session.is_expired()
+                if not session.is_expired(now)
             ]
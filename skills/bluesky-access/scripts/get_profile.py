@@ -12,6 +12,9 @@ Usage:
 Environment variables (from MCP create_session):
     SESSION_ID - Session ID
     PROXY_URL  - Proxy base URL
+    PROFILE_CACHE_TTL - Reuse profiles fetched by this process for this many
+                        seconds, for callers that import get_profile
+                        (default: 0, disabled)
 
 Example:
     SESSION_ID=abc123 PROXY_URL=https://proxy.example.com python get_profile.py bsky.app
@@ -20,8 +23,25 @@ Example:
 import os
 import sys
 import json
+import time
+from functools import lru_cache
 import requests
 
+# Reused across calls so repeated lookups share one TLS connection to the proxy
+_http = requests.Session()
+
+# Display layout used by format_profile
+PROFILE_TEMPLATE = (
+    "@{handle}\n"
+    "Name: {display_name}\n"
+    "Bio: {description}\n"
+    "\n"
+    "Followers: {followers:,}\n"
+    "Following: {following:,}\n"
+    "Posts: {posts:,}\n"
+    "Joined: {created}\n"
+)
+
 
 def get_profile(actor: str) -> dict:
     """
@@ -42,7 +62,23 @@ def get_profile(actor: str) -> dict:
             "Use MCP create_session tool first."
         )
 
-    response = requests.get(
+    cache_ttl = float(os.environ.get("PROFILE_CACHE_TTL", "0"))
+    if cache_ttl > 0:
+        # Entries expire when the time bucket rolls over
+        ttl_bucket = int(time.monotonic() // cache_ttl)
+        return dict(_cached_profile(proxy_url, session_id, actor, ttl_bucket))
+    return _fetch_profile(proxy_url, session_id, actor)
+
+
+@lru_cache(maxsize=256)
+def _cached_profile(proxy_url: str, session_id: str, actor: str, ttl_bucket: int) -> dict:
+    """_fetch_profile memoized per time bucket; errors are not cached."""
+    return _fetch_profile(proxy_url, session_id, actor)
+
+
+def _fetch_profile(proxy_url: str, session_id: str, actor: str) -> dict:
+    """Query the proxy for a profile."""
+    response = _http.get(
         f"{proxy_url}/proxy/bsky/app.bsky.actor.getProfile",
         params={"actor": actor},
         headers={"X-Session-Id": session_id},
@@ -63,23 +99,15 @@ def get_profile(actor: str) -> dict:
 def format_profile(profile: dict) -> str:
     """Format profile for display."""
     handle = profile.get("handle", "unknown")
-    display_name = profile.get("displayName", handle)
-    description = profile.get("description", "No bio")
-    followers = profile.get("followersCount", 0)
-    following = profile.get("followsCount", 0)
-    posts = profile.get("postsCount", 0)
-    created = profile.get("createdAt", "")[:10]
-
-    return (
-        f"@{handle}\n"
-        f"Name: {display_name}\n"
-        f"Bio: {description}\n"
-        f"\n"
-        f"Followers: {followers:,}\n"
-        f"Following: {following:,}\n"
-        f"Posts: {posts:,}\n"
-        f"Joined: {created}\n"
-    )
+    return PROFILE_TEMPLATE.format_map({
+        "handle": handle,
+        "display_name": profile.get("displayName", handle),
+        "description": profile.get("description", "No bio"),
+        "followers": profile.get("followersCount", 0),
+        "following": profile.get("followsCount", 0),
+        "posts": profile.get("postsCount", 0),
+        "created": profile.get("createdAt", "")[:10],
+    })
 
 
 def main():
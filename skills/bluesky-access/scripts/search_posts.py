@@ -8,11 +8,16 @@ Search Bluesky posts via credential proxy.
 
 Usage:
     python search_posts.py <query> [limit]
+    python search_posts.py - [limit]    # one query per line on stdin, run concurrently
 
 Environment variables (from MCP create_session):
     SESSION_ID - Session ID
     PROXY_URL  - Proxy base URL
 
+Optional:
+    SEARCH_CACHE_TTL - Reuse results of identical searches for this many
+                       seconds, across runs (default: 0, disabled)
+
 Example:
     SESSION_ID=abc123 PROXY_URL=https://proxy.example.com python search_posts.py "python" 10
 """
@@ -20,19 +25,78 @@ Example:
 import os
 import sys
 import json
+import time
+import hashlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Reused across calls so repeated searches share one TLS connection to the proxy.
+# Sized for search_posts_many; searches are read-only GETs, so transient
+# upstream errors and rate limits are retried with backoff.
+_http = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=("GET",)
+    )
+)
+_http.mount("http://", _adapter)
+_http.mount("https://", _adapter)
 
+# Printed between posts
+SEPARATOR = "-" * 60
 
-def search_posts(query: str, limit: int = 25) -> dict:
-    """
-    Search Bluesky posts.
+CACHE_DIR = os.path.expanduser("~/.cache/bluesky-access/searchposts")
 
-    Args:
-        query: Search query string
-        limit: Maximum number of results (1-100)
+
+def _cache_path(query: str, limit: int) -> str:
+    digest = hashlib.sha1(f"{query}|{limit}".encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.json")
+
+
+def _cache_get(query: str, limit: int, ttl: float) -> dict | None:
+    """Return a cached response younger than ttl seconds, if any."""
+    try:
+        with open(_cache_path(query, limit)) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Anything but a well-formed entry is treated as a miss
+    if not isinstance(entry, dict):
+        return None
+    ts, data = entry.get("ts"), entry.get("data")
+    if not isinstance(ts, (int, float)) or not isinstance(data, dict):
+        return None
+    if time.time() - ts >= ttl:
+        return None
+    return data
+
+
+def _cache_put(query: str, limit: int, data: dict) -> None:
+    """Store a response; failures only cost the cache."""
+    path = _cache_path(query, limit)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"ts": time.time(), "data": data}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _endpoint_and_headers() -> tuple[str, dict]:
+    """
+    Resolve the search endpoint and auth headers from the environment.
 
     Returns:
-        API response with posts array
+        Tuple of (endpoint URL, request headers)
     """
     session_id = os.environ.get('SESSION_ID')
     proxy_url = os.environ.get('PROXY_URL')
@@ -43,10 +107,33 @@ def search_posts(query: str, limit: int = 25) -> dict:
             "Use MCP create_session tool first."
         )
 
-    response = requests.get(
-        f"{proxy_url}/proxy/bsky/app.bsky.feed.searchPosts",
-        params={"q": query, "limit": min(limit, 100)},
-        headers={"X-Session-Id": session_id},
+    return f"{proxy_url}/proxy/bsky/app.bsky.feed.searchPosts", {"X-Session-Id": session_id}
+
+
+def search_posts(query: str, limit: int = 25) -> dict:
+    """
+    Search Bluesky posts.
+
+    Args:
+        query: Search query string
+        limit: Maximum number of results (1-100)
+
+    Returns:
+        API response with posts array
+    """
+    endpoint, headers = _endpoint_and_headers()
+
+    limit = min(limit, 100)
+    cache_ttl = float(os.environ.get("SEARCH_CACHE_TTL", "0"))
+    if cache_ttl > 0:
+        cached = _cache_get(query, limit, cache_ttl)
+        if cached is not None:
+            return cached
+
+    response = _http.get(
+        endpoint,
+        params={"q": query, "limit": limit},
+        headers=headers,
         timeout=30
     )
 
@@ -56,29 +143,78 @@ def search_posts(query: str, limit: int = 25) -> dict:
         raise ValueError("Session does not have access to bsky service.")
 
     response.raise_for_status()
-    return response.json()
+    result = response.json()
+    if cache_ttl > 0:
+        _cache_put(query, limit, result)
+    return result
+
+
+def search_posts_many(queries: list[str], limit: int = 25,
+                      max_workers: int = 8) -> tuple[dict[str, dict], dict[str, Exception]]:
+    """
+    Run several searches concurrently.
+
+    Each search is one network round-trip, so they run in a thread pool
+    sharing the module's connection pool. A failing query does not abort
+    the others.
+
+    Args:
+        queries: Search query strings
+        limit: Maximum number of results per query (1-100)
+        max_workers: Concurrent requests (default: 8)
+
+    Returns:
+        Tuple of (results, failed): query -> API response for successful
+        searches, and query -> exception for failed ones
+    """
+    results: dict[str, dict] = {}
+    failed: dict[str, Exception] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(search_posts, query, limit): query for query in queries}
+        for future in as_completed(futures):
+            query = futures[future]
+            try:
+                results[query] = future.result()
+            except Exception as e:
+                failed[query] = e
+
+    return results, failed
 
 
 def format_post(post: dict) -> str:
     """Format a post for display."""
-    author = post.get("author", {})
-    handle = author.get("handle", "unknown")
-    display_name = author.get("displayName", handle)
-    record = post.get("record", {})
-    text = record.get("text", "")
-    created_at = record.get("createdAt", "")[:10]  # Just the date
+    post_get = post.get
+    author_get = (post_get("author") or {}).get
+    record_get = (post_get("record") or {}).get
 
-    likes = post.get("likeCount", 0)
-    reposts = post.get("repostCount", 0)
-    replies = post.get("replyCount", 0)
+    handle = author_get("handle", "unknown")
+    display_name = author_get("displayName", handle)
+    created_at = record_get("createdAt", "")[:10]  # Just the date
 
     return (
         f"@{handle} ({display_name}) - {created_at}\n"
-        f"{text}\n"
-        f"[{likes} likes, {reposts} reposts, {replies} replies]\n"
+        f"{record_get('text', '')}\n"
+        f"[{post_get('likeCount', 0)} likes, {post_get('repostCount', 0)} reposts, "
+        f"{post_get('replyCount', 0)} replies]\n"
     )
 
 
+def print_results(query: str, result: dict) -> None:
+    """Print the posts found for one query."""
+    posts = result.get("posts", [])
+
+    if not posts:
+        print(f"No posts found for: {query}")
+        return
+
+    # One write per post (post text, blank line, separator)
+    write = sys.stdout.write
+    write(f"Found {len(posts)} posts for: {query}\n\n{SEPARATOR}\n")
+    for post in posts:
+        write(f"{format_post(post)}\n{SEPARATOR}\n")
+
+
 def main():
     if len(sys.argv) < 2:
         print(__doc__)
@@ -88,19 +224,22 @@ def main():
     limit = int(sys.argv[2]) if len(sys.argv) > 2 else 25
 
     try:
-        result = search_posts(query, limit)
-        posts = result.get("posts", [])
-
-        if not posts:
-            print(f"No posts found for: {query}")
+        if query == "-":
+            queries = list(dict.fromkeys(line.strip() for line in sys.stdin if line.strip()))
+            results, failed = search_posts_many(queries, limit)
+
+            for q in queries:
+                if q in results:
+                    print_results(q, results[q])
+                else:
+                    print(f"Search failed for {q}: {failed[q]}", file=sys.stderr)
+                print()
+
+            if failed:
+                sys.exit(1)
             return
 
-        print(f"Found {len(posts)} posts for: {query}\n")
-        print("-" * 60)
-
-        for post in posts:
-            print(format_post(post))
-            print("-" * 60)
+        print_results(query, search_posts(query, limit))
 
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -7,7 +7,21 @@ Communicates with git bundle proxy server for temporary git operations
 import requests
 import os
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Optional: streams bundle uploads instead of building the body in memory
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# Git identity configured on cloned repositories
+DEFAULT_GIT_EMAIL = 'claude@anthropic.com'
+DEFAULT_GIT_NAME = 'Claude'
 
 class GitProxyClient:
     """Client for communicating with git bundle proxy server"""
@@ -50,19 +64,64 @@ class GitProxyClient:
                 "Set SESSION_ID (for session auth) or GIT_PROXY_KEY (for key auth)."
             )
 
-    def _auth_headers(self) -> dict:
-        """Get authentication headers based on available credentials"""
+        base_url = self.proxy_url.rstrip('/')
+        self._health_url = f'{base_url}/health'
+        self._fetch_bundle_url = f'{base_url}/git/fetch-bundle'
+        self._push_bundle_url = f'{base_url}/git/push-bundle'
+
+        # Pooled session so clone/push sequences reuse the TLS connection
+        # to the proxy. urllib3 only replays idempotent methods once a request
+        # has been sent, so a push is never applied twice.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            # raise_on_status=False: once retries run out, hand back the last
+            # 5xx response (e.g. health_check's JSON body) instead of raising
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504],
+                              raise_on_status=False)
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+        # Authentication header sent with every request, set once
         if self.session_id:
-            return {'X-Session-Id': self.session_id}
-        return {'X-Auth-Key': self.auth_key}
+            self._session.headers['X-Session-Id'] = self.session_id
+        else:
+            self._session.headers['X-Auth-Key'] = self.auth_key
+
+        # (fetched_at monotonic timestamp, response) from the last health check
+        self._health_cache: Optional[tuple[float, dict]] = None
+
+    def close(self) -> None:
+        """Close pooled connections to the proxy server"""
+        self._session.close()
+
+    def __enter__(self) -> 'GitProxyClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def health_check(self, max_age: float = 5.0) -> dict:
+        """
+        Check proxy server health
 
-    def health_check(self) -> dict:
-        """Check proxy server health"""
-        response = requests.get(
-            f'{self.proxy_url}/health',
+        Args:
+            max_age: Reuse a previous response younger than this many seconds
+                     (default: 5). Pass 0 to always query the server.
+        """
+        if self._health_cache and time.monotonic() - self._health_cache[0] < max_age:
+            return dict(self._health_cache[1])
+
+        response = self._session.get(
+            self._health_url,
             timeout=5
         )
-        return response.json()
+        result = response.json()
+        if response.ok:
+            self._health_cache = (time.monotonic(), result)
+        return dict(result)
 
     def fetch_bundle(self, repo_url: str, output_path: str, branch: str = 'main') -> None:
         """
@@ -77,19 +136,21 @@ class GitProxyClient:
             client.fetch_bundle('https://github.com/user/repo.git', 'repo.bundle')
             # Then: git clone repo.bundle repo/
         """
-        response = requests.post(
-            f'{self.proxy_url}/git/fetch-bundle',
+        response = self._session.post(
+            self._fetch_bundle_url,
             json={'repo_url': repo_url, 'branch': branch},
-            headers=self._auth_headers(),
-            timeout=600  # Larger repos may take time
+            timeout=600,  # Larger repos may take time
+            stream=True
         )
 
-        if response.status_code != 200:
-            raise Exception(f"Fetch bundle failed: {response.status_code} - {response.text}")
+        with response:
+            if response.status_code != 200:
+                raise Exception(f"Fetch bundle failed: {response.status_code} - {response.text}")
 
-        # Save bundle file
-        with open(output_path, 'wb') as f:
-            f.write(response.content)
+            # Stream bundle to disk so large repos never sit in memory
+            with open(output_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
 
     def push_bundle(self, bundle_path: str, repo_url: str, branch: str,
                    create_pr: bool = False, pr_title: str = '', pr_body: str = '') -> dict:
@@ -120,7 +181,6 @@ class GitProxyClient:
             print(result['pr_url'])
         """
         with open(bundle_path, 'rb') as f:
-            files = {'bundle': f}
             data = {
                 'repo_url': repo_url,
                 'branch': branch,
@@ -129,13 +189,26 @@ class GitProxyClient:
                 'pr_body': pr_body
             }
 
-            response = requests.post(
-                f'{self.proxy_url}/git/push-bundle',
-                files=files,
-                data=data,
-                headers=self._auth_headers(),
-                timeout=600
-            )
+            if MultipartEncoder is not None:
+                # Stream the multipart body straight from disk
+                encoder = MultipartEncoder(fields={
+                    **data,
+                    'bundle': (os.path.basename(bundle_path), f, 'application/octet-stream')
+                })
+                response = self._session.post(
+                    self._push_bundle_url,
+                    data=encoder,
+                    headers={'Content-Type': encoder.content_type},
+                    timeout=600
+                )
+            else:
+                # requests assembles the whole multipart body in memory
+                response = self._session.post(
+                    self._push_bundle_url,
+                    files={'bundle': f},
+                    data=data,
+                    timeout=600
+                )
 
         if response.status_code != 200:
             raise Exception(f"Push bundle failed: {response.status_code} - {response.text}")
@@ -145,12 +218,27 @@ class GitProxyClient:
 
 # Convenience singleton
 _client = None
+_client_env = None
 
 def get_client() -> GitProxyClient:
-    """Get or create singleton client instance"""
-    global _client
-    if _client is None:
-        _client = GitProxyClient()
+    """
+    Get or create singleton client instance
+
+    The client is rebuilt whenever the proxy URL or credentials in the
+    environment change (e.g. a new SESSION_ID after the old one expired),
+    so it never keeps sending stale auth.
+    """
+    global _client, _client_env
+    env = (
+        os.environ.get('GIT_PROXY_URL') or os.environ.get('PROXY_URL'),
+        os.environ.get('SESSION_ID'),
+        os.environ.get('GIT_PROXY_KEY'),
+    )
+    if _client is None or env != _client_env:
+        new_client = GitProxyClient()
+        if _client is not None:
+            _client.close()
+        _client, _client_env = new_client, env
     return _client
 
 
@@ -169,14 +257,16 @@ def load_env_from_file(env_file: str = '/mnt/project/_env') -> None:
         raise FileNotFoundError(f"Environment file not found: {env_file}")
 
     with open(env_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and '=' in line and not line.startswith('#'):
-                key, value = line.split('=', 1)
-                os.environ[key] = value
+        lines = f.read().splitlines()
+
+    os.environ.update(
+        line.split('=', 1)
+        for line in map(str.strip, lines)
+        if line and '=' in line and not line.startswith('#')
+    )
 
 
-def setup_git_user(repo_dir: str, email: str = 'claude@anthropic.com', name: str = 'Claude') -> None:
+def setup_git_user(repo_dir: str, email: str = DEFAULT_GIT_EMAIL, name: str = DEFAULT_GIT_NAME) -> None:
     """
     Configure git user identity for commits
 
@@ -204,7 +294,7 @@ def setup_git_user(repo_dir: str, email: str = 'claude@anthropic.com', name: str
 
 
 def clone_repo(repo_url: str, target_dir: str, branch: str = 'main',
-               setup_user: bool = True) -> str:
+               setup_user: bool = True, client: Optional[GitProxyClient] = None) -> str:
     """
     One-step clone: fetch bundle and clone into directory
 
@@ -216,6 +306,8 @@ def clone_repo(repo_url: str, target_dir: str, branch: str = 'main',
         target_dir: Directory to clone into (will be created)
         branch: Branch to clone (default: main)
         setup_user: Automatically configure git user (default: True)
+        client: Client to fetch with (default: the shared get_client() instance,
+                so repeated clones reuse its connection to the proxy)
 
     Returns:
         Path to cloned repository
@@ -225,36 +317,86 @@ def clone_repo(repo_url: str, target_dir: str, branch: str = 'main',
         clone_repo('https://github.com/user/repo.git', '/tmp/myrepo')
         # Repository is now cloned at /tmp/myrepo with git user configured
     """
-    client = GitProxyClient()
+    client = client or get_client()
 
     # Create bundle file
     bundle_path = f"{target_dir}.bundle"
 
-    # Fetch bundle
-    client.fetch_bundle(repo_url, bundle_path, branch)
+    try:
+        # Fetch bundle
+        client.fetch_bundle(repo_url, bundle_path, branch)
+
+        # Clone from bundle, writing the git user into the new repo's config
+        # in the same step when requested
+        clone_cmd = ['git', 'clone']
+        if setup_user:
+            clone_cmd += ['--config', f'user.email={DEFAULT_GIT_EMAIL}',
+                          '--config', f'user.name={DEFAULT_GIT_NAME}']
+        subprocess.run(
+            clone_cmd + [bundle_path, target_dir],
+            capture_output=True,
+            text=True,
+            check=True
+        )
 
-    # Clone from bundle
-    result = subprocess.run(
-        ['git', 'clone', bundle_path, target_dir],
-        capture_output=True,
-        text=True,
-        check=True
-    )
+        # Set remote URL (clone always points origin at the bundle itself)
+        subprocess.run(
+            ['git', 'remote', 'set-url', 'origin', repo_url],
+            cwd=target_dir,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    finally:
+        # Clean up bundle file, even if the fetch or clone failed
+        if os.path.exists(bundle_path):
+            os.unlink(bundle_path)
 
-    # Set remote URL
-    subprocess.run(
-        ['git', 'remote', 'set-url', 'origin', repo_url],
-        cwd=target_dir,
-        capture_output=True,
-        text=True,
-        check=True
-    )
+    return target_dir
 
-    # Setup git user if requested
-    if setup_user:
-        setup_git_user(target_dir)
 
-    # Clean up bundle file
-    os.unlink(bundle_path)
+def clone_repos(repos: dict[str, str], branch: str = 'main', setup_user: bool = True,
+                max_workers: Optional[int] = None) -> tuple[dict[str, str], dict[str, Exception]]:
+    """
+    Clone several repositories concurrently
 
-    return target_dir
+    Each clone is dominated by network and server-side git time, so clones
+    run in a thread pool sharing one GitProxyClient (and its connection pool).
+    A failing repository does not abort the others.
+
+    Args:
+        repos: Mapping of repository URL to target directory
+        branch: Branch to clone (default: main)
+        setup_user: Automatically configure git user (default: True)
+        max_workers: Concurrent clones (default: 3/4 of CPUs, at least 2)
+
+    Returns:
+        Tuple of (cloned, failed): repo URL -> target directory for successful
+        clones, and repo URL -> exception for failed ones
+
+    Example:
+        load_env_from_file()
+        cloned, failed = clone_repos({
+            'https://github.com/user/app.git': '/tmp/app',
+            'https://github.com/user/lib.git': '/tmp/lib',
+        })
+    """
+    if max_workers is None:
+        max_workers = max(2, (os.cpu_count() or 4) * 3 // 4)
+
+    cloned: dict[str, str] = {}
+    failed: dict[str, Exception] = {}
+
+    with GitProxyClient() as client, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(clone_repo, repo_url, target_dir, branch, setup_user, client): repo_url
+            for repo_url, target_dir in repos.items()
+        }
+        for future in as_completed(futures):
+            repo_url = futures[future]
+            try:
+                cloned[repo_url] = future.result()
+            except Exception as e:
+                failed[repo_url] = e
+
+    return cloned, failed